@@ -93,6 +93,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Also run SalineVsChemo comparison (Saline, Inhibitory, Excitatory).",
     )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=1,
+        help="Parallel workers for per-trial feature computation (default: 1; 0 = all cores).",
+    )
     return parser.parse_args()
 
 
@@ -118,16 +124,19 @@ def main() -> None:
     dose_label = f"{args.dose_mult}X"
     prefix = f"White_{dose_label}"
 
-    curvature_params = {"bodypart": "Midback", "window": 23}
+    n_jobs = args.n_jobs or None
+    curvature_params = {"bodypart": "Midback", "window": 23, "n_jobs": n_jobs}
     speed_params = {
         "bodypart": "Head",
         "time_limit": None,
         "smooth": False,
         "window": 5,
+        "n_jobs": n_jobs,
     }
     angle_params = {
         "smooth_window": None,
         "likelihood_threshold": 0.65,
+        "n_jobs": n_jobs,
     }
 
     outdir = Path(args.outdir) / args.feature
@@ -28,46 +28,47 @@ def fetch_id_list(
     
     if use_df:
         # CSV/DataFrame mode
-        dlc_table = conn_or_df.copy()
-        
+        dlc_table = conn_or_df
+
+        # Filters shared by all cohorts are evaluated once; each cohort
+        # then only splits the (much smaller) base selection
+        mask = (
+            (dlc_table['genotype'] == genotype) &
+            (dlc_table['dose_mult'] == dose_mult)
+        )
+
+        # Task filter
+        if task_name is not None:
+            if isinstance(task_name, (list, tuple, set)):
+                mask &= dlc_table['task'].isin(task_name)
+            else:
+                mask &= dlc_table['task'] == task_name
+
+        # Min trial length filter
+        if min_trial_length is not None:
+            mask &= dlc_table['trial_length'] >= min_trial_length
+
+        # Remove bad IDs
+        mask &= ~dlc_table['id'].isin(bad_ids)
+
+        base = dlc_table.loc[mask]
+        # Handle modulation filter (match both "NA" string and NaN/null values)
+        base_is_na = (base['modulation'] == "NA") | (base['modulation'].isna())
+
         def _run_df(label, health, modulation):
-            # Apply filters
-            df = dlc_table.loc[
-                (dlc_table['genotype'] == genotype) &
-                (dlc_table['dose_mult'] == dose_mult) &
-                (dlc_table['health'] == health)
-            ].copy()
-            
-            # Handle modulation filter (match both "NA" string and NaN/null values)
             if modulation == "NA":
-                # For "NA", match both the string "NA" and NaN values
-                mask = (df['modulation'] == "NA") | (df['modulation'].isna())
-                df = df.loc[mask]
+                cohort = base_is_na
             else:
                 # For specific modulations, exact match
-                df = df.loc[df['modulation'] == modulation]
-            
-            # Task filter
-            if task_name is not None:
-                if isinstance(task_name, (list, tuple, set)):
-                    df = df[df['task'].isin(task_name)]
-                else:
-                    df = df[df['task'] == task_name]
-            
-            # Min trial length filter
-            if min_trial_length is not None:
-                df = df[df['trial_length'] >= min_trial_length]
-            
-            # Remove bad IDs
-            if not df.empty:
-                df = df[~df['id'].isin(bad_ids)].copy()
-            
+                cohort = base['modulation'] == modulation
+            df = base.loc[cohort & (base['health'] == health)]
+
             # Optional CSV export
             if csv_prefix:
                 df.to_csv(f"{csv_prefix}_{label}.csv", index=False)
-            
+
             return df['id'].tolist()
-        
+
         saline_id  = _run_df("saline",     health="saline",  modulation="NA")
         ghrelin_id = _run_df("ghrelin",    health="ghrelin", modulation="NA")
         Exc_id     = _run_df("excitatory", health="saline",  modulation="Excitatory")
@@ -87,26 +88,31 @@ def fetch_id_list(
         # Optional task filter
         if task_name is not None:
             if isinstance(task_name, (list, tuple, set)):
-                task_list = list(task_name)
-                placeholders = ",".join(["%s"] * len(task_list))
-                where.append(f"task IN ({placeholders})")
-                params.extend(task_list)
+                # One array parameter keeps the statement text fixed for any list length
+                where.append("task = ANY(%s)")
+                params.append(list(task_name))
             else:
                 where.append("task = %s")
                 params.append(task_name)
 
         base_where_sql = " AND ".join(where)
 
+        # All four cohorts come back in one round-trip and are split client-side
+        q = f"""
+            SELECT id, video_name, task, health, genotype, modulation, trial_length, dose_mult
+            FROM dlc_table
+            WHERE {base_where_sql} AND health = ANY(%s) AND modulation = ANY(%s)
+            ORDER BY id;
+        """
+        df_all = pd.read_sql_query(
+            q, conn,
+            params=params + [["saline", "ghrelin"], ["NA", "Excitatory", "Inhibitory"]],
+        )
+        if not df_all.empty:
+            df_all = df_all[~df_all["id"].isin(bad_ids)]
+
         def _run(label, health, modulation):
-            q = f"""
-                SELECT id, video_name, task, health, genotype, modulation, trial_length, dose_mult
-                FROM dlc_table
-                WHERE {base_where_sql} AND health = %s AND modulation = %s
-                ORDER BY id;
-            """
-            df = pd.read_sql_query(q, conn, params=params + [health, modulation])
-            if not df.empty:
-                df = df[~df["id"].isin(bad_ids)].copy()
+            df = df_all[(df_all["health"] == health) & (df_all["modulation"] == modulation)]
             if csv_prefix:
                 df.to_csv(f"{csv_prefix}_{label}.csv", index=False)
             return df["id"].tolist()
@@ -1,8 +1,94 @@
+import os
+import threading
 import numpy as np
 import pandas as pd
 import cv2
 from pathlib import Path
 
+try:
+    from scripts.config import get_project_root
+except Exception:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from scripts.config import get_project_root
+
+
+def _interp_nan(a):
+    """Linearly fill NaNs, holding edge values (like interpolate(limit_direction='both'))."""
+    bad = np.isnan(a)
+    if not bad.any() or bad.all():
+        return a
+    good_idx = np.flatnonzero(~bad)
+    out = a.copy()
+    out[bad] = np.interp(np.flatnonzero(bad), good_idx, a[good_idx])
+    return out
+
+
+def _minmax_scale(a):
+    """Scale to [0, 1] by the array's own NaN-ignoring range (one reduction per bound)."""
+    lo = np.nanmin(a)
+    hi = np.nanmax(a)
+    return (a - lo) / (hi - lo + 1e-8)
+
+
+# Corner homography per (csv_path, mtime_ns, likelihood_threshold); H is invariant
+# across bodyparts of the same video, so repeated calls for one trial reuse it
+_HOMOGRAPHY_CACHE = {}
+_HOMOGRAPHY_CACHE_SIZE = 32
+# Batch motion features call in from worker threads
+_CACHE_LOCK = threading.Lock()
+
+
+def _is_degenerate_quad(corners, rel_tol=1e-6):
+    """True if any three of the four (4, 2) corners are (nearly) collinear.
+
+    getPerspectiveTransform does not fail on such input; it returns a near-singular
+    matrix that maps every point to roughly the same place.
+    """
+    # The four cyclic triples are all C(4, 3) triples of the quad
+    d1 = np.roll(corners, -1, axis=0) - corners
+    d2 = np.roll(corners, -2, axis=0) - corners
+    cross = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+    scale = np.ptp(corners, axis=0).max()
+    return bool((np.abs(cross) <= rel_tol * scale * scale).any())
+
+
+def _corner_homography(df_dlc, csv_path, likelihood_threshold):
+    """Return the 3x3 arena-corner homography for a DLC DataFrame, or None if a corner is missing or degenerate."""
+    key = (csv_path, os.stat(csv_path).st_mtime_ns, likelihood_threshold)
+    with _CACHE_LOCK:
+        if key in _HOMOGRAPHY_CACHE:
+            return _HOMOGRAPHY_CACHE[key]
+
+    # One (N, 4, 3) block of corner x/y/likelihood, masked and reduced in one call
+    cols = [('Corner' + str(i), c) for i in range(1, 5) for c in ('x', 'y', 'likelihood')]
+    # Explicit copy: the block is masked in place below
+    block = df_dlc[cols].to_numpy(dtype=np.float64, copy=True).reshape(-1, 4, 3)
+    xy = block[:, :, :2]
+    xy[block[:, :, 2] < likelihood_threshold] = np.nan
+    corners = np.nanmedian(xy, axis=0)
+
+    H = None
+    if not np.isnan(corners).any() and not _is_degenerate_quad(corners):
+        src_pts = corners.astype(np.float32)
+        dst_pts = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+        # Exactly four correspondences determine H: closed-form solve, no RANSAC/refinement
+        H = cv2.getPerspectiveTransform(src_pts, dst_pts)
+
+    with _CACHE_LOCK:
+        if len(_HOMOGRAPHY_CACHE) >= _HOMOGRAPHY_CACHE_SIZE:
+            _HOMOGRAPHY_CACHE.pop(next(iter(_HOMOGRAPHY_CACHE)))
+        _HOMOGRAPHY_CACHE[key] = H
+    return H
+
+
+def _apply_homography(H, x_vals, y_vals):
+    """Map (x, y) through the 3x3 homography H."""
+    # Expanded H @ [x, y, 1]^T: three elementwise passes, no homogeneous buffer
+    (a, b, c), (d, e, f), (g, h, i) = H
+    w = g * x_vals + h * y_vals + i
+    return (a * x_vals + b * y_vals + c) / w, (d * x_vals + e * y_vals + f) / w
+
 def get_normalized_bodypart(trial_id, dlc_table, bodypart='Midback', 
                                     likelihood_threshold=0.5, 
                                     normalize=True,
@@ -36,62 +122,36 @@ def get_normalized_bodypart(trial_id, dlc_table, bodypart='Midback',
     
     # If path is relative, resolve it from project root
     if not Path(csv_path).is_absolute():
-        # Get project root (2 levels up: normalized_bodypart.py -> analysis -> scripts -> root)
-        project_root = Path(__file__).resolve().parents[2]
-        csv_path = str(project_root / csv_path)
+        csv_path = str(get_project_root() / csv_path)
 
     try:
         df_dlc = pd.read_csv(csv_path, header=[1, 2], index_col=0)
 
-        x = df_dlc[(bodypart, 'x')].copy()
-        y = df_dlc[(bodypart, 'y')].copy()
-        p = df_dlc[(bodypart, 'likelihood')]
+        x_vals = df_dlc[(bodypart, 'x')].to_numpy(dtype=float, copy=True)
+        y_vals = df_dlc[(bodypart, 'y')].to_numpy(dtype=float, copy=True)
 
         # Set low-likelihood to NaN
-        x[p < likelihood_threshold] = np.nan
-        y[p < likelihood_threshold] = np.nan
+        low = df_dlc[(bodypart, 'likelihood')].to_numpy() < likelihood_threshold
+        x_vals[low] = np.nan
+        y_vals[low] = np.nan
 
         if interpolate:
-            x = pd.Series(x).interpolate(limit_direction='both')
-            y = pd.Series(y).interpolate(limit_direction='both')
-
-        x_vals = x.to_numpy()
-        y_vals = y.to_numpy()
+            x_vals = _interp_nan(x_vals)
+            y_vals = _interp_nan(y_vals)
 
         if normalize:
             if use_homography:
-                corners = []
-                for i in range(1, 5):
-                    cx = df_dlc[('Corner' + str(i), 'x')]
-                    cy = df_dlc[('Corner' + str(i), 'y')]
-                    cp = df_dlc[('Corner' + str(i), 'likelihood')]
-
-                    cx[cp < likelihood_threshold] = np.nan
-                    cy[cp < likelihood_threshold] = np.nan
-
-                    corners.append((np.nanmedian(cx), np.nanmedian(cy)))
-
-                if all(not np.isnan(pt[0]) and not np.isnan(pt[1]) for pt in corners):
-                    src_pts = np.array(corners, dtype=np.float32)
-                    dst_pts = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
-                    H, _ = cv2.findHomography(src_pts, dst_pts)
-
-                    points = np.vstack([x_vals, y_vals]).T
-                    ones = np.ones((points.shape[0], 1))
-                    homogenous_points = np.hstack([points, ones])
-                    normalized = (H @ homogenous_points.T).T
-                    normalized /= normalized[:, 2][:, None]
-
-                    x_vals = normalized[:, 0]
-                    y_vals = normalized[:, 1]
+                H = _corner_homography(df_dlc, csv_path, likelihood_threshold)
+                if H is not None:
+                    x_vals, y_vals = _apply_homography(H, x_vals, y_vals)
                 else:
-                    print(f"[WARNING] Trial {trial_id}: Homography failed due to missing corner medians. Falling back to min-max.")
-                    x_vals = (x_vals - np.nanmin(x_vals)) / (np.nanmax(x_vals) - np.nanmin(x_vals) + 1e-8)
-                    y_vals = (y_vals - np.nanmin(y_vals)) / (np.nanmax(y_vals) - np.nanmin(y_vals) + 1e-8)
+                    print(f"[WARNING] Trial {trial_id}: Homography failed due to missing or degenerate corner medians. Falling back to min-max.")
+                    x_vals = _minmax_scale(x_vals)
+                    y_vals = _minmax_scale(y_vals)
 
             else:
-                x_vals = (x_vals - np.nanmin(x_vals)) / (np.nanmax(x_vals) - np.nanmin(x_vals) + 1e-8)
-                y_vals = (y_vals - np.nanmin(y_vals)) / (np.nanmax(y_vals) - np.nanmin(y_vals) + 1e-8)
+                x_vals = _minmax_scale(x_vals)
+                y_vals = _minmax_scale(y_vals)
 
         return x_vals, y_vals
 
@@ -6,10 +6,58 @@ Combines barplot, distribution, and histogram/boxplot utilities.
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import numpy as np
-import pandas as pd
 from scipy.stats import gaussian_kde
 
 
+def _compose_query(conn, query: str, **columns) -> str:
+    """Render `query` with `{name}` placeholders quoted as SQL identifiers.
+
+    Value placeholders (%s) are left untouched for the driver to bind.
+    """
+    from psycopg2 import sql
+
+    identifiers = {name: sql.Identifier(col) for name, col in columns.items()}
+    return sql.SQL(query).format(**identifiers).as_string(conn)
+
+
+_FETCH_CHUNK_ROWS = 50_000
+
+
+def _iter_row_chunks(conn, query: str, params=None):
+    """Yield the rows of `query` in chunks from a server-side cursor.
+
+    Only one chunk of row tuples is held client-side at a time, however many
+    rows the query returns.
+    """
+    # Named cursors need a transaction; withhold lets them work under autocommit too
+    with conn.cursor(name='plot_features_fetch',
+                     withhold=bool(getattr(conn, 'autocommit', False))) as cur:
+        cur.itersize = _FETCH_CHUNK_ROWS
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(_FETCH_CHUNK_ROWS)
+            if not rows:
+                return
+            yield rows
+
+
+def _fetch_id_values(conn, query: str, ids):
+    """Run an `(id, value)` query bound to `ids` and return (ids, values) as NumPy arrays.
+
+    Rows are streamed in chunks and converted straight to arrays, so neither a
+    DataFrame nor the full list of row tuples is held in memory (unnested array
+    columns can yield millions of rows). NULL values come back as NaN.
+    """
+    id_chunks, value_chunks = [], []
+    for rows in _iter_row_chunks(conn, query, (ids,)):
+        id_chunks.append(np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)))
+        value_chunks.append(np.fromiter((np.nan if r[1] is None else r[1] for r in rows),
+                                        dtype=np.float64, count=len(rows)))
+    if not id_chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return np.concatenate(id_chunks), np.concatenate(value_chunks)
+
+
 def plot_feature_barplot(conn, *id_lists, feature='distance', group_labels=None, ax=None):
     """
     Plots a bar plot for a given feature across multiple groups of IDs using a colormap.
@@ -29,14 +77,18 @@ def plot_feature_barplot(conn, *id_lists, feature='distance', group_labels=None,
 
     means, sems = [], []
 
+    # One round-trip for all groups; split by id client-side
+    all_ids = sorted({int(i) for id_list in id_lists for i in id_list})
+    query = _compose_query(conn, """
+    SELECT id, {feature}
+    FROM dlc_table
+    WHERE id = ANY(%s) AND {feature} IS NOT NULL;
+    """, feature=feature)
+    row_ids, row_vals = _fetch_id_values(conn, query, all_ids)
+
     for id_list in id_lists:
-        query = f"""
-        SELECT {feature}
-        FROM dlc_table
-        WHERE id = ANY(%s) AND {feature} IS NOT NULL;
-        """
-        df = pd.read_sql_query(query, conn, params=(id_list,))
-        values = df[feature].dropna().values
+        values = row_vals[np.isin(row_ids, list(id_list))]
+        values = values[~np.isnan(values)]
         means.append(values.mean() if len(values) > 0 else np.nan)
         sems.append(values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else np.nan)
 
@@ -81,10 +133,12 @@ def plot_feature_distribution(conn, *id_lists, feature='cumulative_distance',
         FROM information_schema.columns
         WHERE table_name = 'dlc_table' AND column_name = %s;
     """
-    col_info = pd.read_sql_query(check_query, conn, params=(feature,))
-    if col_info.empty:
+    with conn.cursor() as cur:
+        cur.execute(check_query, (feature,))
+        col_info = cur.fetchone()
+    if col_info is None:
         raise ValueError(f"Column '{feature}' does not exist in 'dlc_table'.")
-    is_array = col_info['data_type'].iloc[0] == 'ARRAY'
+    is_array = col_info[0] == 'ARRAY'
 
     if ax is None:
         fig, ax = plt.subplots(figsize=(6, 4))
@@ -92,21 +146,25 @@ def plot_feature_distribution(conn, *id_lists, feature='cumulative_distance',
     cmap = cm.get_cmap('tab10')
     colors = [cmap(i / max(1, len(id_lists) - 1)) for i in range(len(id_lists))]
 
+    # One round-trip for all groups; split by id client-side
+    all_ids = sorted({int(i) for id_list in id_lists for i in id_list})
+    if is_array:
+        query = _compose_query(conn, """
+        SELECT id, unnest({feature}) AS val
+        FROM dlc_table
+        WHERE id = ANY(%s) AND {feature} IS NOT NULL;
+        """, feature=feature)
+    else:
+        query = _compose_query(conn, """
+        SELECT id, {feature} AS val
+        FROM dlc_table
+        WHERE id = ANY(%s) AND {feature} IS NOT NULL;
+        """, feature=feature)
+    row_ids, row_vals = _fetch_id_values(conn, query, all_ids)
+
     for i, id_list in enumerate(id_lists):
-        if is_array:
-            query = f"""
-            SELECT unnest({feature}) AS val
-            FROM dlc_table
-            WHERE id = ANY(%s) AND {feature} IS NOT NULL;
-            """
-        else:
-            query = f"""
-            SELECT {feature} AS val
-            FROM dlc_table
-            WHERE id = ANY(%s) AND {feature} IS NOT NULL;
-            """
-        df = pd.read_sql_query(query, conn, params=(id_list,))
-        values = df['val'].dropna().values
+        values = row_vals[np.isin(row_ids, list(id_list))]
+        values = values[~np.isnan(values)]
 
         if len(values) < 2:
             continue
@@ -148,19 +206,21 @@ def plot_feature_histogram_and_boxplot(conn, column_name, bins=50):
         fig: Matplotlib Figure object
     """
     # Query non-null values
-    query = f"""
+    query = _compose_query(conn, """
     SELECT {column_name}
     FROM dlc_table
     WHERE {column_name} IS NOT NULL;
-    """
-    df = pd.read_sql_query(query, conn)
-
-    if df.empty:
+    """, column_name=column_name)
+    # Whole-column query: stream it in chunks straight into a float array
+    values = np.concatenate(
+        [np.fromiter((v for (v,) in rows), dtype=np.float64, count=len(rows))
+         for rows in _iter_row_chunks(conn, query)]
+        or [np.empty(0, dtype=np.float64)]
+    )
+
+    if values.size == 0:
         raise ValueError(f"No non-null data found for column '{column_name}'.")
 
-    # Convert to float array
-    values = np.array([float(v) for v in df[column_name]])
-
     # Plotting
     fig, axes = plt.subplots(nrows=2, figsize=(6, 6), gridspec_kw={'height_ratios': [3, 1]})
     
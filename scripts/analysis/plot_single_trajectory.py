@@ -11,6 +11,9 @@ def plot_single_trajectory(dlc_table, trial_id, bodypart='Midback',
                            ):
     """
     Plot trajectory from DLC CSV for a given bodypart (interpolated + normalized).
+
+    When overlaying several trials, create one axis up front and pass it as
+    `ax`; axis inversion and aspect are only applied once per axis.
     """
     # Load and optionally normalize/interpolate bodypart coordinates
     x, y = get_normalized_bodypart(
@@ -34,8 +37,11 @@ def plot_single_trajectory(dlc_table, trial_id, bodypart='Midback',
 
     # Plot title (optional)
     ax.set_title(f"Trial {trial_id} | {bodypart}")
-    ax.invert_yaxis()
-    ax.set_aspect('equal')
+    # Guard so repeated calls on a shared axis don't flip it back
+    if not ax.yaxis_inverted():
+        ax.invert_yaxis()
+    if ax.get_aspect() not in ('equal', 1.0):
+        ax.set_aspect('equal')
 
     # Plotting
     if style == 'scatter':
@@ -7,10 +7,12 @@ Provides:
 - get_data_dir(): returns the data directory path
 - load_dlc_table(): loads dlc_table.csv into a pandas DataFrame
 """
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 
 
+@lru_cache(maxsize=None)
 def get_project_root() -> Path:
     """Return the project root directory (parent of scripts/)."""
     return Path(__file__).resolve().parents[1]
@@ -5,13 +5,13 @@ This package contains modules for computing behavioral features from DeepLabCut
 
 Main modules:
 - angle_features: Compute angle-based features (head-body misalignment, tail bend, etc.)
-- db_utils: Database utility functions (get_trial_meta, get_csv_path, etc.)
+- db_utils: Database utility functions (get_trial_meta, get_csv_path, get_frame_rate, etc.)
 - motion_features: Compute motion-based features
 - spatial_entropy: Spatial distribution analysis
 """
 
 # Import commonly used functions for easy access
-from .db_utils import get_trial_meta, get_csv_path
+from .db_utils import get_trial_meta, get_csv_path, get_frame_rate
 from .angle_features import angle_features_for_trial, batch_angle_features
 
 # Make these available when someone does: from features import *
@@ -20,4 +20,5 @@ __all__ = [
     'batch_angle_features', 
     'get_trial_meta',
     'get_csv_path',
+    'get_frame_rate',
 ]
\ No newline at end of file
@@ -11,72 +11,193 @@ The main functions are:
 Author: DeepLabCut Analysis Pipeline
 """
 
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 
 # Import utilities from the new db_utils module (support both package and script execution)
 try:
-    from .db_utils import get_trial_meta, get_csv_path
+    from .db_utils import get_trial_meta, get_csv_path, get_trial_meta_bulk
 except Exception:
     import sys
     from pathlib import Path
     sys.path.append(str(Path(__file__).resolve().parents[2]))
-    from scripts.features.db_utils import get_trial_meta, get_csv_path
+    from scripts.features.db_utils import get_trial_meta, get_csv_path, get_trial_meta_bulk
+from scripts.config import get_project_root
+from scripts.analysis.normalized_bodypart import _interp_nan
 
 # ---------- math utils ----------
-def _angle_of(v: np.ndarray) -> np.ndarray:
-    """Compute the angle of 2D vectors."""
-    return np.arctan2(v[:, 1], v[:, 0])
-
-def _unit(v: np.ndarray) -> np.ndarray:
-    """Convert vectors to unit vectors, handling zero-length vectors."""
-    n = np.linalg.norm(v, axis=1, keepdims=True)
-    with np.errstate(invalid='ignore', divide='ignore'):
-        return np.where(n > 0, v / n, np.nan)
-
-def _angle_between(u: np.ndarray, v: np.ndarray) -> np.ndarray:
-    """Compute the signed angle between two sets of 2D vectors."""
-    uu, vv = _unit(u), _unit(v)
-    dot = np.sum(uu * vv, axis=1)
-    cross_z = uu[:, 0]*vv[:, 1] - uu[:, 1]*vv[:, 0]
-    return np.arctan2(cross_z, dot)
+def _angle_of(vx: np.ndarray, vy: np.ndarray) -> np.ndarray:
+    """Compute the angle of 2D vectors given as separate x/y components."""
+    return np.arctan2(vy, vx)
+
+def _angle_between(ux: np.ndarray, uy: np.ndarray, vx: np.ndarray, vy: np.ndarray) -> np.ndarray:
+    """Compute the signed angle between two sets of 2D vectors (separate x/y components)."""
+    # atan2 is invariant to positive scaling of both arguments, so no normalisation
+    dot = ux*vx + uy*vy
+    cross_z = ux*vy - uy*vx
+    ang = np.arctan2(cross_z, dot)
+    # Zero-length vectors have no direction (cross and dot both vanish only then)
+    ang[(cross_z == 0) & (dot == 0)] = np.nan
+    return ang
+
+def _compute_all_angles(head: Tuple[np.ndarray, np.ndarray], neck: Tuple[np.ndarray, np.ndarray],
+                        mid: Tuple[np.ndarray, np.ndarray], low: Tuple[np.ndarray, np.ndarray],
+                        tail: Tuple[np.ndarray, np.ndarray]) -> Dict[str, np.ndarray]:
+    """All per-frame body angles from the five (x, y) keypoint arrays in one pass."""
+    # Contiguous per-component arrays: every ufunc below runs at unit stride
+    (hx, hy), (nx, ny), (mx, my), (lx, ly), (tx, ty) = head, neck, mid, low, tail
+    tail_head = (hx - tx, hy - ty)
+    head_neck = (hx - nx, hy - ny)
+    neck_mid  = (nx - mx, ny - my)
+    mid_low   = (mx - lx, my - ly)
+    low_tail  = (lx - tx, ly - ty)
+
+    # Negating both vectors leaves cross and dot unchanged, so the bends use them as-is
+    bend_neck = _angle_between(*head_neck, *neck_mid)
+    bend_mid  = _angle_between(*neck_mid,  *mid_low)
+    bend_low  = _angle_between(*mid_low,   *low_tail)
+
+    # Head direction and the head-neck segment angle are the same quantity
+    theta_head = _angle_of(*head_neck)
+
+    return dict(
+        theta_body=_angle_of(*tail_head),
+        theta_head=theta_head,
+        theta_seg_head_neck=theta_head,
+        theta_seg_neck_mid=_angle_of(*neck_mid),
+        theta_seg_mid_low=_angle_of(*mid_low),
+        theta_seg_low_tail=_angle_of(*low_tail),
+        head_body_misalignment=_angle_between(*tail_head, *head_neck),
+        bend_neck=bend_neck,
+        bend_mid=bend_mid,
+        bend_low=bend_low,
+        tail_bend_index=np.abs(bend_neck) + np.abs(bend_mid) + np.abs(bend_low),
+    )
 
 def _unwrap(a: np.ndarray) -> np.ndarray:
     """Unwrap angles to remove discontinuities."""
     return np.unwrap(a)
 
+def _wrapped_diff(a: np.ndarray) -> np.ndarray:
+    """Frame-to-frame angle steps with 2*pi jumps removed, i.e. np.diff(np.unwrap(a))."""
+    d = np.diff(a)
+    d_mod = np.mod(d + np.pi, 2.0 * np.pi) - np.pi
+    d_mod[(d_mod == -np.pi) & (d > 0)] = np.pi
+    return np.where(np.abs(d) < np.pi, d, d_mod)
+
+def _angular_rate(theta: np.ndarray, smooth_window: Optional[int], dt: float) -> np.ndarray:
+    """Time derivative of a wrapped angle series, optionally boxcar-smoothed after unwrapping."""
+    if theta.size < 2:
+        raise ValueError("Need at least 2 frames to differentiate the body angle.")
+    if smooth_window and smooth_window >= 3:
+        if smooth_window % 2 == 0:
+            smooth_window += 1
+        k = smooth_window // 2
+        pad = np.pad(_unwrap(theta), (k, k), mode='edge')
+        # O(T) running mean: window sums as differences of one cumulative sum
+        csum = np.cumsum(np.concatenate(([0.0], pad)))
+        steps = np.diff((csum[smooth_window:] - csum[:-smooth_window]) / smooth_window)
+    else:
+        # Unsmoothed: the unwrapped series is never needed, only its steps
+        steps = _wrapped_diff(theta)
+
+    # Uniform-spacing central difference with one-sided edges (same as np.gradient(theta_u, dt)):
+    # interior u[i+1] - u[i-1] is the sum of the two neighbouring steps
+    rate = np.empty(theta.size, dtype=np.float64)
+    np.add(steps[1:], steps[:-1], out=rate[1:-1])
+    rate[1:-1] /= 2.0 * dt
+    rate[0] = steps[0] / dt
+    rate[-1] = steps[-1] / dt
+    return rate
+
+def _percentile(x: np.ndarray, q: float) -> float:
+    """Linear-interpolated percentile of a NaN-free 1D array via O(n) np.partition."""
+    k = (x.size - 1) * (q / 100.0)
+    lo = int(np.floor(k))
+    hi = min(lo + 1, x.size - 1)
+    part = np.partition(x, [lo, hi])
+    a, b = part[lo], part[hi]
+    t = k - lo
+    # Same lerp as np.percentile(method='linear') so results match exactly
+    return float(b - (b - a) * (1.0 - t)) if t >= 0.5 else float(a + (b - a) * t)
+
 # ---------- I/O helpers ----------
-def _load_bodyparts_raw(csv_path: str, bodyparts: List[str], likelihood_threshold: float = 0.5) -> Dict[str, np.ndarray]:
-    """Load and interpolate bodypart coordinates from DeepLabCut CSV file."""
+@lru_cache(maxsize=64)
+def _dlc_column_index(csv_path: str, mtime_ns: int) -> Dict[Tuple[str, str], int]:
+    """Map (bodypart, coord) to its column position from the three DLC header rows."""
+    # mtime_ns is only part of the cache key, so a rewritten CSV gets re-parsed
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)                # scorer
+        bodyparts = next(reader)
+        coords = next(reader)
+    return {(bp, c): i for i, (bp, c) in enumerate(zip(bodyparts, coords)) if i > 0}
+
+def _load_bodyparts_raw(csv_path: str, bodyparts: List[str],
+                        likelihood_threshold: float = 0.5) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Load and interpolate bodypart coordinates from DeepLabCut CSV file as separate (x, y) arrays.
+
+    Results are cached per file version; the returned arrays are read-only.
+    """
     # If path is relative, resolve it from project root
     csv_path_obj = Path(csv_path)
     if not csv_path_obj.is_absolute():
-        # Get project root (2 levels up from this file: angle_features.py -> features -> scripts -> root)
-        project_root = Path(__file__).resolve().parents[2]
-        csv_path = str(project_root / csv_path)
-    
-    df = pd.read_csv(csv_path, header=[1, 2], index_col=0)
-    out: Dict[str, np.ndarray] = {}
+        csv_path = str(get_project_root() / csv_path)
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    return _load_bodyparts_cached(csv_path, mtime_ns, tuple(bodyparts), likelihood_threshold)
+
+@lru_cache(maxsize=16)
+def _load_bodyparts_cached(csv_path: str, mtime_ns: int, bodyparts: Tuple[str, ...],
+                           likelihood_threshold: float) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Uncached body of _load_bodyparts_raw; mtime_ns keys out rewritten CSVs."""
+    # Parse the header once per file version and read only the needed columns as a
+    # flat float block, skipping the MultiIndex header and per-column dtype inference
+    col = _dlc_column_index(csv_path, mtime_ns)
+    wanted = [(bp, c) for bp in bodyparts for c in ('x', 'y', 'likelihood') if (bp, c) in col]
+    missing = [(bp, c) for bp in bodyparts for c in ('x', 'y') if (bp, c) not in col]
+    if missing:
+        raise KeyError(f"Columns not found in {csv_path}: {missing}")
+    usecols = sorted(col[k] for k in wanted)
+    frame = pd.read_csv(csv_path, header=None, skiprows=3, usecols=usecols,
+                        dtype=np.float64, engine='c')
+    # One writable (n_cols, T) copy: each column is a contiguous row that can be
+    # masked in place, so no per-coordinate copies are needed below
+    cols = np.array(frame.to_numpy().T, dtype=np.float64, order='C')
+    pos = {k: usecols.index(col[k]) for k in wanted}
+
+    out: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
     for bp in bodyparts:
-        x = df[(bp, 'x')].astype(float).copy()
-        y = df[(bp, 'y')].astype(float).copy()
-        if (bp, 'likelihood') in df.columns:
-            p = df[(bp, 'likelihood')].astype(float).copy()
-            x[p < likelihood_threshold] = np.nan
-            y[p < likelihood_threshold] = np.nan
-        xs = pd.Series(x).interpolate(limit_direction='both')
-        ys = pd.Series(y).interpolate(limit_direction='both')
-        out[bp] = np.column_stack([xs.to_numpy(dtype=float), ys.to_numpy(dtype=float)])
+        x = cols[pos[(bp, 'x')]]
+        y = cols[pos[(bp, 'y')]]
+        if (bp, 'likelihood') in pos:
+            low = cols[pos[(bp, 'likelihood')]] < likelihood_threshold
+            x[low] = np.nan
+            y[low] = np.nan
+        x, y = _interp_nan(x), _interp_nan(y)
+        # Cached arrays are shared between callers
+        x.flags.writeable = False
+        y.flags.writeable = False
+        out[bp] = (x, y)
     return out
 
+def clear_pose_cache() -> None:
+    """Drop cached DLC headers and bodypart arrays (e.g. between batches in a long-running process)."""
+    _dlc_column_index.cache_clear()
+    _load_bodyparts_cached.cache_clear()
+
 # ---------- core per-trial ----------
 def angle_features_for_trial(
     dlc_table: pd.DataFrame,
     trial_id: int,
     likelihood_threshold: float = 0.5,
     smooth_window: Optional[int] = None,
+    meta: Optional[Tuple[Optional[float], Optional[float], Optional[str]]] = None,
 ) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, float]], np.ndarray]:
     """
     Compute angle-based features for a single trial.
@@ -86,89 +207,86 @@ def angle_features_for_trial(
         trial_id: Trial identifier
         likelihood_threshold: Minimum likelihood for pose data
         smooth_window: Window size for smoothing (optional)
+        meta: Prefetched (trial_length_s, frame_rate, csv_path) from
+            get_trial_meta_bulk(); looked up in dlc_table when None
     
     Returns:
         Tuple of (timeseries_dict, summary_dict, valid_frames)
     """
-    trial_length_s, frame_rate = get_trial_meta(dlc_table, trial_id)
+    trial_length_s, frame_rate, csv_path = _trial_inputs(dlc_table, trial_id, meta)
+    return _angle_features_from_csv(csv_path, trial_length_s, frame_rate,
+                                    likelihood_threshold, smooth_window)
+
+def _trial_inputs(
+    dlc_table: pd.DataFrame,
+    trial_id: int,
+    meta: Optional[Tuple[Optional[float], Optional[float], Optional[str]]] = None,
+) -> Tuple[float, float, str]:
+    """Validated (trial_length_s, frame_rate, csv_path) for one trial, from meta if given."""
+    if meta is None:
+        trial_length_s, frame_rate = get_trial_meta(dlc_table, trial_id)
+    else:
+        trial_length_s, frame_rate, csv_path = meta
     if frame_rate is None or not np.isfinite(frame_rate) or frame_rate <= 0:
         raise ValueError(f"Missing/invalid frame_rate for trial {trial_id}.")
-    csv_path = get_csv_path(dlc_table, trial_id)
-    
-    # Optional debug output - remove in production
-    # print(f"[INFO] csv path: {csv_path}")
-
+    if meta is None:
+        csv_path = get_csv_path(dlc_table, trial_id)
+    elif csv_path is None:
+        raise ValueError(f"csv_file_path not found for id={trial_id}")
+    return trial_length_s, frame_rate, csv_path
+
+def _angle_features_from_csv(
+    csv_path: str,
+    trial_length_s: float,
+    frame_rate: float,
+    likelihood_threshold: float = 0.5,
+    smooth_window: Optional[int] = None,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, float]], np.ndarray]:
+    """Angle features from a DLC CSV and already-resolved trial metadata (no table lookups)."""
     parts = ["Head", "Neck", "Midback", "Lowerback", "Tailbase"]
     B = _load_bodyparts_raw(csv_path, parts, likelihood_threshold=likelihood_threshold)
-    head, neck = B["Head"], B["Neck"]
-    mid, low  = B["Midback"], B["Lowerback"]
-    tail      = B["Tailbase"]
-
-    v_tail_head = head - tail
-    v_head_neck = head - neck
-    v_neck_mid  = neck - mid
-    v_mid_low   = mid - low
-    v_low_tail  = low - tail
-
-
-    theta_body = _angle_of(v_tail_head)
-    theta_head = _angle_of(v_head_neck)
-    theta_seg_head_neck = _angle_of(v_head_neck)
-    theta_seg_neck_mid  = _angle_of(v_neck_mid)
-    theta_seg_mid_low   = _angle_of(v_mid_low)
-    theta_seg_low_tail  = _angle_of(v_low_tail)
-
-    head_body_misalignment = _angle_between(v_tail_head, v_head_neck)
-    bend_neck = _angle_between(-v_head_neck, -v_neck_mid)
-    bend_mid  = _angle_between(-v_neck_mid,  -v_mid_low)
-    bend_low  = _angle_between(-v_mid_low,   -v_low_tail)
-    tail_bend_index = np.abs(bend_neck) + np.abs(bend_mid) + np.abs(bend_low)
-
-    theta_body_u = _unwrap(theta_body.copy())
-    if smooth_window and smooth_window >= 3:
-        if smooth_window % 2 == 0:
-            smooth_window += 1
-        k = smooth_window // 2
-        pad = np.pad(theta_body_u, (k, k), mode='edge')
-        kern = np.ones(smooth_window) / smooth_window
-        theta_body_u = np.convolve(pad, kern, mode='valid')
+    angles = _compute_all_angles(B["Head"], B["Neck"], B["Midback"], B["Lowerback"], B["Tailbase"])
+    theta_body = angles["theta_body"]
 
     dt = 1.0 / float(frame_rate)
-    ang_vel_body = np.gradient(theta_body_u, dt)   # rad/s
+    ang_vel_body = _angular_rate(theta_body, smooth_window, dt)   # rad/s
 
     timeseries = dict(
         theta_body=theta_body,
-        theta_head=theta_head,
-        theta_seg_head_neck=theta_seg_head_neck,
-        theta_seg_neck_mid=theta_seg_neck_mid,
-        theta_seg_mid_low=theta_seg_mid_low,
-        theta_seg_low_tail=theta_seg_low_tail,
-        head_body_misalignment=head_body_misalignment,
-        bend_neck=bend_neck,
-        bend_mid=bend_mid,
-        bend_low=bend_low,
+        theta_head=angles["theta_head"],
+        theta_seg_head_neck=angles["theta_seg_head_neck"],
+        theta_seg_neck_mid=angles["theta_seg_neck_mid"],
+        theta_seg_mid_low=angles["theta_seg_mid_low"],
+        theta_seg_low_tail=angles["theta_seg_low_tail"],
+        head_body_misalignment=angles["head_body_misalignment"],
+        bend_neck=angles["bend_neck"],
+        bend_mid=angles["bend_mid"],
+        bend_low=angles["bend_low"],
         ang_vel_body=ang_vel_body,                 # rad/s
-        tail_bend_index=tail_bend_index,
+        tail_bend_index=angles["tail_bend_index"],
     )
 
     def _stats(x: np.ndarray) -> Dict[str, float]:
+        # One finite mask; the filtered array is NaN-free, so the plain reductions
+        # apply and skip the nan* variants' extra masking/copy per statistic
         x = x[np.isfinite(x)]
         if x.size == 0:
             return dict(mean=np.nan, std=np.nan, max=np.nan, p95=np.nan)
+        mean = x.mean()
         return dict(
-            mean=float(np.nanmean(x)),
-            std=float(np.nanstd(x)),
-            max=float(np.nanmax(x)),
-            p95=float(np.nanpercentile(x, 95)),
+            mean=float(mean),
+            std=float(np.sqrt(np.mean(np.square(x - mean)))),
+            max=float(x.max()),
+            p95=_percentile(x, 95),
         )
 
     summary = {
-        "head_body_misalignment": _stats(head_body_misalignment),  # radians
-        "tail_bend_index":        _stats(tail_bend_index),         # radians
-        "ang_vel_body":           _stats(ang_vel_body),            # rad/s
-        "abs_bend_neck":          _stats(np.abs(bend_neck)),       # radians
-        "abs_bend_mid":           _stats(np.abs(bend_mid)),        # radians
-        "abs_bend_low":           _stats(np.abs(bend_low)),        # radians
+        "head_body_misalignment": _stats(timeseries["head_body_misalignment"]),  # radians
+        "tail_bend_index":        _stats(timeseries["tail_bend_index"]),         # radians
+        "ang_vel_body":           _stats(ang_vel_body),                          # rad/s
+        "abs_bend_neck":          _stats(np.abs(timeseries["bend_neck"])),       # radians
+        "abs_bend_mid":           _stats(np.abs(timeseries["bend_mid"])),        # radians
+        "abs_bend_low":           _stats(np.abs(timeseries["bend_low"])),        # radians
         # Include meta so the batch can compute per-minute views consistently
         "_meta": {"trial_length_s": float(trial_length_s), "frame_rate": float(frame_rate)},
     }
@@ -177,11 +295,54 @@ def angle_features_for_trial(
     return timeseries, summary, valid
 
 # ---------- batch processing ----------
+# Output columns of batch_angle_features, in the order _angle_worker returns them
+_ANGLE_COLUMNS = (
+    "trial_id", "trial_length_s", "minutes",
+    # orientation/bend magnitudes (unitless radians): keep as-is
+    "head_body_misalignment_mean", "head_body_misalignment_p95",
+    "tail_bend_index_mean", "tail_bend_index_p95",
+    "abs_bend_neck_mean", "abs_bend_mid_mean", "abs_bend_low_mean",
+    # angular velocity (rate) in rad/s
+    "ang_vel_body_mean_s", "ang_vel_body_p95_s",
+    # per-minute view (rad/min)
+    "ang_vel_body_mean_min", "ang_vel_body_p95_min",
+)
+
+def _angle_worker(
+    tid: int,
+    trial_length_s: float,
+    frame_rate: float,
+    csv_path: str,
+    likelihood_threshold: float,
+    smooth_window: Optional[int],
+) -> Tuple[float, ...]:
+    """One summary row of batch_angle_features (in _ANGLE_COLUMNS order); top-level so it can run in a worker process."""
+    _, sm, _ = _angle_features_from_csv(csv_path, trial_length_s, frame_rate,
+                                        likelihood_threshold, smooth_window)
+
+    # meta
+    trial_len_s = sm["_meta"]["trial_length_s"]
+    minutes = trial_len_s / 60.0 if np.isfinite(trial_len_s) and trial_len_s > 0 else np.nan
+
+    # Per-minute scaling: only for *rates* (ang_vel_body is in rad/s → rad/min by *60).
+    ang_mean_per_min = sm["ang_vel_body"]["mean"] * 60.0 if np.isfinite(sm["ang_vel_body"]["mean"]) else np.nan
+    ang_p95_per_min  = sm["ang_vel_body"]["p95"]  * 60.0 if np.isfinite(sm["ang_vel_body"]["p95"])  else np.nan
+
+    return (
+        tid, trial_len_s, minutes,
+        sm["head_body_misalignment"]["mean"], sm["head_body_misalignment"]["p95"],
+        sm["tail_bend_index"]["mean"], sm["tail_bend_index"]["p95"],
+        sm["abs_bend_neck"]["mean"], sm["abs_bend_mid"]["mean"], sm["abs_bend_low"]["mean"],
+        sm["ang_vel_body"]["mean"], sm["ang_vel_body"]["p95"],
+        ang_mean_per_min, ang_p95_per_min,
+    )
+
 def batch_angle_features(
     dlc_table: pd.DataFrame,
     id_list: List[int],
     likelihood_threshold: float = 0.5,
     smooth_window: Optional[int] = None,
+    n_jobs: Optional[int] = 1,
 ) -> pd.DataFrame:
     """
     Compute angle features for multiple trials.
@@ -191,49 +352,31 @@ def batch_angle_features(
         id_list: List of trial IDs to process
         likelihood_threshold: Minimum likelihood for pose data
         smooth_window: Window size for smoothing (optional)
+        n_jobs: Worker processes for the per-trial computation (1 = serial, None = all cores)
     
     Returns:
         DataFrame with angle features for all trials
     """
-    rows: List[Dict[str, Any]] = []
-    for tid in id_list:
-        ts, sm, _ = angle_features_for_trial(
-            dlc_table, tid,
-            likelihood_threshold=likelihood_threshold,
-            smooth_window=smooth_window,
-        )
-
-        # meta
-        trial_len_s = sm["_meta"]["trial_length_s"]
-        minutes = trial_len_s / 60.0 if np.isfinite(trial_len_s) and trial_len_s > 0 else np.nan
-
-        # Per-minute scaling: only for *rates* (ang_vel_body is in rad/s → rad/min by *60).
-        ang_mean_per_min = sm["ang_vel_body"]["mean"] * 60.0 if np.isfinite(sm["ang_vel_body"]["mean"]) else np.nan
-        ang_p95_per_min  = sm["ang_vel_body"]["p95"]  * 60.0 if np.isfinite(sm["ang_vel_body"]["p95"])  else np.nan
-
-        rows.append(dict(
-            trial_id=tid,
-            trial_length_s=trial_len_s,
-            minutes=minutes,
-
-            # orientation/bend magnitudes (unitless radians): keep as-is
-            head_body_misalignment_mean=sm["head_body_misalignment"]["mean"],
-            head_body_misalignment_p95 =sm["head_body_misalignment"]["p95"],
-            tail_bend_index_mean       =sm["tail_bend_index"]["mean"],
-            tail_bend_index_p95        =sm["tail_bend_index"]["p95"],
-            abs_bend_neck_mean         =sm["abs_bend_neck"]["mean"],
-            abs_bend_mid_mean          =sm["abs_bend_mid"]["mean"],
-            abs_bend_low_mean          =sm["abs_bend_low"]["mean"],
-
-            # angular velocity (rate) in rad/s
-            ang_vel_body_mean_s        =sm["ang_vel_body"]["mean"],
-            ang_vel_body_p95_s         =sm["ang_vel_body"]["p95"],
-
-            # per-minute view (rad/min)
-            ang_vel_body_mean_min      =ang_mean_per_min,
-            ang_vel_body_p95_min       =ang_p95_per_min,
-        ))
-    return pd.DataFrame(rows)
+    # Metadata for every trial in one pass over dlc_table, resolved here so
+    # workers only need plain, picklable arguments
+    meta = get_trial_meta_bulk(dlc_table, id_list)
+    missing = (None, None, None)
+    jobs = [(tid, *_trial_inputs(dlc_table, tid, meta.get(tid, missing)),
+             likelihood_threshold, smooth_window)
+            for tid in id_list]
+
+    # Typed column block filled row by row, then framed once without per-row dicts
+    values = np.empty((len(jobs), len(_ANGLE_COLUMNS)), dtype=np.float64)
+    if n_jobs == 1 or len(jobs) < 2:
+        for i, job in enumerate(jobs):
+            values[i] = _angle_worker(*job)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count() or 1) as pool:
+            for i, row in enumerate(pool.map(_angle_worker, *zip(*jobs))):
+                values[i] = row
+    out = dict(zip(_ANGLE_COLUMNS, values.T))
+    out["trial_id"] = np.asarray(id_list, dtype=np.int64)
+    return pd.DataFrame(out)
 
 
 def main(dlc_table: pd.DataFrame, trial_id: int):
@@ -4,9 +4,56 @@ Utility functions for the features package.
 CSV-based data access functions for trial metadata and file paths.
 """
 
+import weakref
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from scripts.config import get_project_root
+except Exception:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from scripts.config import get_project_root
+
+# Row position of each id in the most recently used dlc_table, so per-trial lookups
+# are a dict hit instead of a boolean mask over the whole table. Only positions are
+# cached; values are always read from the table itself.
+_ROW_INDEX = {'table': None, 'shape': None, 'pos': {}}
+
+
+def _build_row_index(dlc_table: pd.DataFrame) -> Dict[int, int]:
+    """Rebuild the id -> row position map for dlc_table and make it the cached one."""
+    ids = dlc_table['id'].tolist()
+    # Built back to front so the first occurrence wins, like iloc[0] after masking
+    pos = {tid: i for i, tid in reversed(list(enumerate(ids)))}
+    _ROW_INDEX.update(table=weakref.ref(dlc_table), shape=dlc_table.shape, pos=pos)
+    return pos
+
+
+def _row_position(dlc_table: pd.DataFrame, trial_id: int) -> Optional[int]:
+    """Position of the first row with this id in dlc_table, or None if absent."""
+    table_ref = _ROW_INDEX['table']
+    fresh = table_ref is None or table_ref() is not dlc_table or _ROW_INDEX['shape'] != dlc_table.shape
+    index = _build_row_index(dlc_table) if fresh else _ROW_INDEX['pos']
+    pos = index.get(trial_id)
+    if fresh:
+        return pos
+    # In-place sorts or id edits keep identity and shape, so check the hit against
+    # the table itself (O(1)) and rebuild when the cached position has gone stale
+    if pos is None or dlc_table['id'].iat[pos] != trial_id:
+        pos = _build_row_index(dlc_table).get(trial_id)
+    return pos
+
+
+def clear_meta_cache() -> None:
+    """Forget the cached id index and release the table it refers to."""
+    _ROW_INDEX.update(table=None, shape=None, pos={})
+
+
+def _cell(dlc_table: pd.DataFrame, pos: int, column: str):
+    """Value at (row position, column name), or None if the column is missing."""
+    return dlc_table[column].iat[pos] if column in dlc_table.columns else None
 
 
 def get_trial_meta(dlc_table: pd.DataFrame, trial_id: int) -> Tuple[Optional[float], Optional[float]]:
@@ -20,13 +67,13 @@ def get_trial_meta(dlc_table: pd.DataFrame, trial_id: int) -> Tuple[Optional[flo
     Returns:
         Tuple of (trial_length_s, frame_rate_fps), or (None, None) if not found
     """
-    row = dlc_table[dlc_table['id'] == trial_id]
+    pos = _row_position(dlc_table, trial_id)
     
-    if row.empty:
+    if pos is None:
         return None, None
     
-    trial_length = row['trial_length'].iloc[0] if 'trial_length' in row.columns else None
-    frame_rate = row['frame_rate'].iloc[0] if 'frame_rate' in row.columns else None
+    trial_length = _cell(dlc_table, pos, 'trial_length')
+    frame_rate = _cell(dlc_table, pos, 'frame_rate')
     
     # Convert to float if not None
     trial_length = float(trial_length) if trial_length is not None and pd.notna(trial_length) else None
@@ -35,6 +82,71 @@ def get_trial_meta(dlc_table: pd.DataFrame, trial_id: int) -> Tuple[Optional[flo
     return trial_length, frame_rate
 
 
+def get_frame_rate(dlc_table: pd.DataFrame, trial_id: int) -> float:
+    """
+    Returns frame_rate (fps) for a trial from dlc_table DataFrame.
+    
+    Args:
+        dlc_table: DataFrame containing trial metadata
+        trial_id: Trial identifier
+        
+    Returns:
+        Frame rate as float
+        
+    Raises:
+        ValueError: If frame_rate is missing or NaN for the trial ID
+    """
+    pos = _row_position(dlc_table, trial_id)
+    if pos is None or 'frame_rate' not in dlc_table.columns:
+        raise ValueError(f"frame_rate not found for id={trial_id}")
+    
+    fps = _cell(dlc_table, pos, 'frame_rate')
+    if pd.isna(fps):
+        raise ValueError(f"Invalid frame_rate for id={trial_id}")
+    
+    return float(fps)
+
+
+def get_frame_rates(dlc_table: pd.DataFrame, trial_ids: List[int]) -> Dict[int, float]:
+    """
+    Returns {trial_id: frame_rate} for many trials in one pass over dlc_table.
+    Trials with missing/NaN frame_rate are omitted.
+    """
+    if 'frame_rate' not in dlc_table.columns:
+        return {}
+    rows = dlc_table.loc[dlc_table['id'].isin(trial_ids), ['id', 'frame_rate']]
+    rows = rows.drop_duplicates('id').dropna()
+    return dict(zip(rows['id'], rows['frame_rate'].astype(float)))
+
+
+def get_trial_meta_bulk(
+    dlc_table: pd.DataFrame, trial_ids: List[int]
+) -> Dict[int, Tuple[Optional[float], Optional[float], Optional[str]]]:
+    """
+    Returns {trial_id: (trial_length_s, frame_rate_fps, csv_path)} for many trials
+    in one pass over dlc_table. Missing/NaN values are None; csv_path is resolved
+    from the project root like get_csv_path(). Unknown trial IDs are omitted.
+    """
+    rows = dlc_table.loc[dlc_table['id'].isin(trial_ids)].drop_duplicates('id')
+
+    def _col(name, cast):
+        if name not in rows.columns:
+            return [None] * len(rows)
+        return [cast(v) if pd.notna(v) else None for v in rows[name]]
+
+    def _resolve(path):
+        path = str(path)
+        return path if Path(path).is_absolute() else str(get_project_root() / path)
+
+    return {
+        int(tid): (trial_length, frame_rate, csv_path)
+        for tid, trial_length, frame_rate, csv_path in zip(rows['id'],
+                                                           _col('trial_length', float),
+                                                           _col('frame_rate', float),
+                                                           _col('csv_file_path', _resolve))
+    }
+
+
 def get_csv_path(dlc_table: pd.DataFrame, trial_id: int) -> str:
     """
     Get CSV file path from dlc_table DataFrame for a given trial ID.
@@ -50,12 +162,12 @@ def get_csv_path(dlc_table: pd.DataFrame, trial_id: int) -> str:
     Raises:
         ValueError: If CSV path not found for the trial ID
     """
-    row = dlc_table[dlc_table['id'] == trial_id]
+    pos = _row_position(dlc_table, trial_id)
     
-    if row.empty or 'csv_file_path' not in row.columns:
+    if pos is None or 'csv_file_path' not in dlc_table.columns:
         raise ValueError(f"csv_file_path not found for id={trial_id}")
     
-    csv_path = row['csv_file_path'].iloc[0]
+    csv_path = _cell(dlc_table, pos, 'csv_file_path')
     
     if pd.isna(csv_path):
         raise ValueError(f"csv_file_path is None for id={trial_id}")
@@ -64,8 +176,6 @@ def get_csv_path(dlc_table: pd.DataFrame, trial_id: int) -> str:
     
     # If path is relative, resolve it from project root
     if not Path(csv_path).is_absolute():
-        # Get project root (2 levels up from this file: db_utils.py -> features -> scripts -> root)
-        project_root = Path(__file__).resolve().parents[2]
-        csv_path = str(project_root / csv_path)
+        csv_path = str(get_project_root() / csv_path)
     
     return csv_path
\ No newline at end of file
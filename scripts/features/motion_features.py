@@ -1,32 +1,54 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
+from scipy.ndimage import uniform_filter1d
 from typing import List, Tuple, Optional
 
-
-def _get_fps(dlc_table: pd.DataFrame, trial_id: int) -> float:
-    """Fetch per-trial frame rate from dlc_table DataFrame."""
-    row = dlc_table[dlc_table['id'] == trial_id]
-    if row.empty or 'frame_rate' not in row.columns:
-        raise ValueError(f"Missing frame_rate for ID {trial_id}")
-    
-    fps = row['frame_rate'].iloc[0]
-    if pd.isna(fps):
-        raise ValueError(f"Invalid frame_rate for ID {trial_id}")
-    
-    return float(fps)
+try:
+    from scripts.analysis.normalized_bodypart import get_normalized_bodypart
+    from scripts.features.db_utils import get_frame_rate, get_frame_rates
+except Exception:
+    # If running as a script, ensure project root is on sys.path then retry
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from scripts.analysis.normalized_bodypart import get_normalized_bodypart
+    from scripts.features.db_utils import get_frame_rate, get_frame_rates
 
 
 def compute_motion_features(dlc_table: pd.DataFrame, trial_id: int, 
                             bodypart='Midback',
                             time_limit: Optional[float] = None, 
                             smooth: bool = False, 
-                            window: int = 5) -> Tuple[List[float], List[float], List[float]]:
+                            window: int = 5,
+                            frame_rate: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Compute framewise motion features: distance, velocity, and acceleration
     using normalized bodypart coordinates from get_normalized_bodypart().
+
+    frame_rate may be passed when already known (e.g. prefetched for a batch)
+    to skip the dlc_table lookup.
+
+    Returns full-precision float64 arrays of length N-1, N-1 and N-2.
     """
-    from scripts.analysis.normalized_bodypart import get_normalized_bodypart
+    xy, frame_rate = _trial_xy(dlc_table, trial_id, bodypart, time_limit, smooth, window, frame_rate)
+
+    dx, dy = np.diff(xy, axis=1)
+    distance = _step_length(dx, dy)
 
+    # Frames are uniformly spaced, so dividing by dt is multiplying by the frame rate
+    velocity = distance * frame_rate
+    acceleration = np.diff(velocity)
+    acceleration *= frame_rate
+
+    return distance, velocity, acceleration
+
+
+def _trial_xy(dlc_table: pd.DataFrame, trial_id: int, bodypart: str,
+              time_limit: Optional[float], smooth: bool, window: int,
+              frame_rate: Optional[float]) -> Tuple[np.ndarray, float]:
+    """Load, time-mask and optionally smooth one trial: ((2, N) x/y array, frame_rate)."""
     x_vals, y_vals = get_normalized_bodypart(
         trial_id=trial_id, 
         dlc_table=dlc_table, 
@@ -39,41 +61,45 @@ def compute_motion_features(dlc_table: pd.DataFrame, trial_id: int,
         raise ValueError(f"Could not load normalized data for ID {trial_id}")
 
     # Get frame rate from dlc_table
-    frame_rate = _get_fps(dlc_table, trial_id)
-    t_vals = np.arange(len(x_vals)) / frame_rate
+    if frame_rate is None:
+        frame_rate = get_frame_rate(dlc_table, trial_id)
+    if frame_rate <= 0:
+        raise ValueError(f"Invalid frame_rate={frame_rate} for id={trial_id}")
+
+    # Keep x/y packed as one (2, N) array so masking, smoothing and
+    # differencing each make a single pass over both coordinates
+    xy = np.vstack([x_vals, y_vals])
 
     if time_limit is not None:
+        t_vals = np.arange(xy.shape[1]) / frame_rate
         mask = (t_vals >= 0) & (t_vals <= time_limit)
         if not np.any(mask):
             raise ValueError(f"No frames in time range for ID {trial_id}")
-        x_vals = x_vals[mask]
-        y_vals = y_vals[mask]
-        t_vals = t_vals[mask]
+        xy = xy[:, mask]
 
-    if len(t_vals) < 3:
+    if xy.shape[1] < 3:
         raise ValueError(f"Not enough valid frames for ID {trial_id}")
 
     if smooth:
-        from scipy.ndimage import uniform_filter1d
-        x_vals = uniform_filter1d(x_vals, size=window)
-        y_vals = uniform_filter1d(y_vals, size=window)
+        xy = uniform_filter1d(xy, size=window, axis=1)
 
-    dx = np.diff(x_vals)
-    dy = np.diff(y_vals)
-    dt = np.diff(t_vals)
+    return xy, frame_rate
 
-    distance = np.sqrt(dx**2 + dy**2)
-    velocity = np.divide(distance, dt, out=np.zeros_like(distance), where=dt != 0)
 
-    acc = np.diff(velocity)
-    dt2 = dt[1:]
-    acceleration = np.divide(acc, dt2, out=np.zeros_like(acc), where=dt2 != 0)
+def _step_length(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """Euclidean step length; squared length accumulated in place, then sqrt into the same buffer."""
+    distance = dx * dx
+    distance += dy * dy
+    np.sqrt(distance, out=distance)
+    return distance
 
-    return (
-        np.round(distance, 4).tolist(),
-        np.round(velocity, 4).tolist(),
-        np.round(acceleration, 4).tolist()
-    )
+
+def _ragged_diff(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    np.diff along the last axis of concatenated segments (segment k spans
+    offsets[k]:offsets[k+1]), dropping the steps that straddle two segments.
+    """
+    return np.delete(np.diff(values), offsets[1:-1] - 1, axis=-1)
 
 
 def batch_compute_motion_feature(
@@ -83,26 +109,67 @@ def batch_compute_motion_feature(
     feature: str = 'distance',
     time_limit: Optional[float] = None, 
     smooth: bool = False, 
-    window: int = 5
+    window: int = 5,
+    n_jobs: Optional[int] = 1
 ) -> List[np.ndarray]:
     """
     Compute a specified motion feature ('distance', 'velocity', 'acceleration') for a batch of trials.
     Uses normalized (x, y) from get_normalized_bodypart().
+
+    n_jobs: Worker threads for the per-trial computation (1 = serial, None = all cores).
     """
     assert feature in ['distance', 'velocity', 'acceleration'], "Invalid feature name"
 
-    results = []
-    for trial_id in trial_ids:
+    # Frame rates for the whole batch in one pass over dlc_table
+    frame_rates = get_frame_rates(dlc_table, trial_ids)
+
+    def _xy_or_error(trial_id):
         try:
-            dis, vel, acc = compute_motion_features(
-                dlc_table, trial_id, bodypart, time_limit, smooth, window
-            )
-            feature_map = {'distance': dis, 'velocity': vel, 'acceleration': acc}
-            results.append(np.array(feature_map[feature]))
+            return _trial_xy(dlc_table, trial_id, bodypart, time_limit, smooth, window,
+                             frame_rates.get(trial_id)), None
         except Exception as e:
-            print(f"Skipping ID {trial_id}: {e}")
+            return None, e
+
+    # Loading/masking/smoothing stays per trial; the arithmetic below runs once
+    # over all trials concatenated, so short trials don't pay per-call overhead
+    xys, fps = [], []
+    for trial_id, (loaded, err) in zip(trial_ids, _map_trials(_xy_or_error, trial_ids, n_jobs)):
+        if err is not None:
+            print(f"Skipping ID {trial_id}: {err}")
             continue
-    return results
+        xys.append(loaded[0])
+        fps.append(loaded[1])
+    if not xys:
+        return []
+
+    lengths = np.array([xy.shape[1] for xy in xys])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    dx, dy = _ragged_diff(np.concatenate(xys, axis=1), offsets)
+    values = _step_length(dx, dy)
+    # Each step/velocity sample is one frame shorter per trial than the last
+    offsets -= np.arange(len(offsets))
+
+    if feature != 'distance':
+        values *= np.repeat(fps, lengths - 1)
+    if feature == 'acceleration':
+        values = _ragged_diff(values, offsets)
+        values *= np.repeat(fps, lengths - 2)
+        offsets -= np.arange(len(offsets))
+
+    return np.split(values, offsets[1:-1])
+
+
+def _map_trials(func, trial_ids: List[int], n_jobs: Optional[int]):
+    """
+    Apply func to each trial ID, in order. n_jobs != 1 runs the calls on a thread
+    pool: CSV parsing and the NumPy kernels release the GIL, and threads share
+    dlc_table and the homography cache without pickling.
+    """
+    if n_jobs == 1 or len(trial_ids) < 2:
+        return map(func, trial_ids)
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count() or 1) as pool:
+        return list(pool.map(func, trial_ids))
 
 
 def compute_motion_features_per_minute(
@@ -114,21 +181,25 @@ def compute_motion_features_per_minute(
     window: int = 5,
     min_duration_s: float = 5.0,
     return_diagnostics: bool = False,
+    frame_rate: Optional[float] = None,
 ) -> float | tuple[float, dict]:
     """
     Return a single scalar: average speed in arena-units per minute for one trial.
     Uses compute_motion_features(...) under the hood.
 
+    frame_rate may be passed when already known; otherwise it is looked up once
+    and shared with compute_motion_features.
+
     If return_diagnostics=True, returns (velocity_per_min, info_dict).
     """
+    fps = frame_rate if frame_rate is not None else get_frame_rate(dlc_table, trial_id)
+
     # Get per-frame arrays via your existing function
     distance, velocity, _ = compute_motion_features(
         dlc_table=dlc_table, trial_id=trial_id, bodypart=bodypart,
-        time_limit=time_limit, smooth=smooth, window=window
+        time_limit=time_limit, smooth=smooth, window=window, frame_rate=fps
     )
 
-    fps = _get_fps(dlc_table, trial_id)
-
     # distance has length N-1 for N frames; duration (s) ~ len(distance)/fps
     frames_of_motion = len(distance)
     duration_s = frames_of_motion / fps if frames_of_motion else 0.0
@@ -167,24 +238,36 @@ def batch_compute_motion_features_per_minute(
     time_limit: Optional[float] = None,
     smooth: bool = False,
     window: int = 5,
-    min_duration_s: float = 5.0
+    min_duration_s: float = 5.0,
+    n_jobs: Optional[int] = 1
 ) -> pd.DataFrame:
     """
     Vectorized convenience: one row per trial with velocity_per_min (units/min) and diagnostics.
+
+    n_jobs: Worker threads for the per-trial computation (1 = serial, None = all cores).
     """
-    rows = []
-    for tid in trial_ids:
+    # Frame rates for the whole batch in one pass over dlc_table
+    frame_rates = get_frame_rates(dlc_table, trial_ids)
+
+    def _row_or_error(tid):
         try:
             vpm, diag = compute_motion_features_per_minute(
                 dlc_table, tid, bodypart=bodypart,
                 time_limit=time_limit, smooth=smooth, window=window,
-                min_duration_s=min_duration_s, return_diagnostics=True
+                min_duration_s=min_duration_s, return_diagnostics=True,
+                frame_rate=frame_rates.get(tid)
             )
-            rows.append({**diag, "velocity_per_min": float(vpm)})
         except Exception as e:
+            return None, e
+        return {**diag, "velocity_per_min": float(vpm)}, None
+
+    rows = []
+    for tid, (row, err) in zip(trial_ids, _map_trials(_row_or_error, trial_ids, n_jobs)):
+        if err is not None:
             # Keep going; you can log/print if desired
-            print(f"Skipping ID {tid}: {e}")
+            print(f"Skipping ID {tid}: {err}")
             continue
+        rows.append(row)
 
     return pd.DataFrame(rows)
 
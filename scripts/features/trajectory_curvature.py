@@ -1,29 +1,21 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import numpy as np
 import pandas as pd
 from scipy.ndimage import uniform_filter1d
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 try:
     from scripts.analysis.normalized_bodypart import get_normalized_bodypart
+    from scripts.features.db_utils import get_frame_rate, get_frame_rates
 except Exception:
     # If running as a script, ensure project root is on sys.path then retry
     import sys
     from pathlib import Path
     sys.path.append(str(Path(__file__).resolve().parents[2]))
     from scripts.analysis.normalized_bodypart import get_normalized_bodypart
-
-
-def _get_frame_rate(dlc_table: pd.DataFrame, trial_id: int) -> float:
-    """Fetch frame_rate metadata for a trial."""
-    row = dlc_table[dlc_table['id'] == trial_id]
-    if row.empty or 'frame_rate' not in row.columns:
-        raise ValueError(f"frame_rate not found for id={trial_id}")
-    
-    fps = row['frame_rate'].iloc[0]
-    if pd.isna(fps):
-        raise ValueError(f"Invalid frame_rate for id={trial_id}")
-    
-    return float(fps)
+    from scripts.features.db_utils import get_frame_rate, get_frame_rates
 
 
 def compute_trajectory_curvature(dlc_table: pd.DataFrame,
@@ -32,7 +24,8 @@ def compute_trajectory_curvature(dlc_table: pd.DataFrame,
                                  time_limit: float = None,   # <-- default None
                                  smooth: bool = True,
                                  window: int = 19,
-                                 speed_thresh: float = 1e-2) -> Tuple[List[float], float]:
+                                 speed_thresh: float = 1e-2,
+                                 frame_rate: Optional[float] = None) -> Tuple[List[float], float]:
     """
     Compute trajectory curvature for a given trial using normalized/interpolated coordinates.
 
@@ -44,6 +37,7 @@ def compute_trajectory_curvature(dlc_table: pd.DataFrame,
         smooth: If True, smooth coordinates before computing curvature.
         window: Smoothing window size in samples (ignored if smooth=False).
         speed_thresh: Set curvature to 0 where speed < threshold (units/sec in normalized space).
+        frame_rate: Precomputed frame rate; skips the dlc_table lookup when given.
 
     Returns:
         Tuple:
@@ -56,7 +50,8 @@ def compute_trajectory_curvature(dlc_table: pd.DataFrame,
     y_vals = np.asarray(y_vals, dtype=float)
 
     # 2) Metadata
-    frame_rate = _get_frame_rate(dlc_table, trial_id)
+    if frame_rate is None:
+        frame_rate = get_frame_rate(dlc_table, trial_id)
     if frame_rate <= 0:
         raise ValueError(f"Invalid frame_rate={frame_rate} for id={trial_id}")
 
@@ -69,32 +64,36 @@ def compute_trajectory_curvature(dlc_table: pd.DataFrame,
     if x_vals.size < 5:
         raise ValueError(f"Not enough data points for ID {trial_id} after time_limit.")
 
+    # x/y stacked as one (2, N) array: smoothing and each derivative is a single call
+    xy = np.vstack([x_vals, y_vals])
+
     # 4) Optional smoothing
     if smooth and window and window > 1:
         w = int(window)
         if w % 2 == 0:
             w += 1
         w = max(3, w)
-        x_vals = uniform_filter1d(x_vals, size=w, mode='nearest')
-        y_vals = uniform_filter1d(y_vals, size=w, mode='nearest')
+        xy = uniform_filter1d(xy, size=w, mode='nearest', axis=1)
 
-    # 5) Derivatives
-    dt = 1.0 / frame_rate
-    dx = np.gradient(x_vals, dt)
-    dy = np.gradient(y_vals, dt)
-    ddx = np.gradient(dx, dt)
-    ddy = np.gradient(dy, dt)
+    # 5) Derivatives per frame. Curvature is invariant to the time scale (the dt^3
+    #    factors of numerator and denominator cancel), so no division by dt is needed;
+    #    only the speed threshold is converted from units/sec to units/frame below.
+    d1 = np.gradient(xy, axis=1)
+    dx, dy = d1
+    ddx, ddy = np.gradient(d1, axis=1)
 
     # 6) Curvature
-    speed = np.hypot(dx, dy)
+    # Squared speed serves both the denominator and the threshold test; no sqrt pass
+    speed2 = dx*dx + dy*dy
     numerator = np.abs(dx * ddy - dy * ddx)
-    denom = np.power(dx*dx + dy*dy, 1.5)
+    denom = np.power(speed2, 1.5)
 
     with np.errstate(divide='ignore', invalid='ignore'):
         curvature = np.where(denom != 0, numerator / denom, np.nan)
 
     if speed_thresh is not None and speed_thresh > 0:
-        curvature = np.where(speed < speed_thresh, 0.0, curvature)
+        thresh_per_frame = speed_thresh / frame_rate
+        curvature = np.where(speed2 < thresh_per_frame * thresh_per_frame, 0.0, curvature)
 
     valid = np.isfinite(curvature)
     mean_curv = float(np.mean(curvature[valid])) if np.any(valid) else float('nan')
@@ -108,7 +107,8 @@ def batch_trajectory_curvature(dlc_table: pd.DataFrame,
                                time_limit: float = None,   # <-- default None
                                smooth: bool = True,
                                window: int = 5,
-                               speed_thresh: float = 1e-2) -> pd.DataFrame:
+                               speed_thresh: float = 1e-2,
+                               n_jobs: Optional[int] = 1) -> pd.DataFrame:
     """
     Compute mean curvature for a list of trial IDs.
 
@@ -120,25 +120,66 @@ def batch_trajectory_curvature(dlc_table: pd.DataFrame,
         smooth: Whether to smooth trajectory.
         window: Smoothing window size in samples.
         speed_thresh: Speed threshold to suppress curvature (units/sec).
+        n_jobs: Worker processes for the per-trial computation (1 = serial, None = all cores).
 
     Returns:
         DataFrame with columns ['id', 'mean_curvature']
     """
-    rows = []
-    for tid in trial_ids:
-        try:
-            _, mean_curv = compute_trajectory_curvature(
-                dlc_table, tid,
-                bodypart=bodypart,
-                time_limit=time_limit,
-                smooth=smooth,
-                window=window,
-                speed_thresh=speed_thresh
-            )
-            rows.append({'id': tid, 'mean_curvature': mean_curv})
-        except Exception as e:
-            print(f"Skipping ID {tid}: {e}")
-    return pd.DataFrame(rows)
+    fps_by_id = get_frame_rates(dlc_table, trial_ids)
+    frame_rates = [fps_by_id.get(tid) for tid in trial_ids]
+    params = dict(bodypart=bodypart, time_limit=time_limit, smooth=smooth,
+                  window=window, speed_thresh=speed_thresh)
+
+    if n_jobs == 1 or len(trial_ids) < 2:
+        results = map(_mean_curvature_or_error, repeat(dlc_table), trial_ids, frame_rates, repeat(params))
+        return _curvature_frame(trial_ids, results)
+
+    workers = n_jobs or os.cpu_count() or 1
+    # dlc_table is shipped once per worker process rather than once per trial
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_table,
+                             initargs=(dlc_table,)) as pool:
+        results = pool.map(_worker_mean_curvature, trial_ids, frame_rates, repeat(params),
+                           chunksize=max(1, len(trial_ids) // (4 * workers)))
+        return _curvature_frame(trial_ids, results)
+
+
+def _mean_curvature_or_error(dlc_table: pd.DataFrame, tid: int, frame_rate: Optional[float],
+                             params: dict) -> Tuple[Optional[float], Optional[str]]:
+    """(mean_curvature, None) for one trial, or (None, error message) if it fails."""
+    try:
+        _, mean_curv = compute_trajectory_curvature(dlc_table, tid, frame_rate=frame_rate, **params)
+        return mean_curv, None
+    except Exception as e:
+        return None, str(e)
+
+
+_WORKER_TABLE: Optional[pd.DataFrame] = None
+
+
+def _set_worker_table(dlc_table: pd.DataFrame) -> None:
+    """Pool initializer: keep the metadata table in the worker process."""
+    global _WORKER_TABLE
+    _WORKER_TABLE = dlc_table
+
+
+def _worker_mean_curvature(tid: int, frame_rate: Optional[float],
+                           params: dict) -> Tuple[Optional[float], Optional[str]]:
+    return _mean_curvature_or_error(_WORKER_TABLE, tid, frame_rate, params)
+
+
+def _curvature_frame(trial_ids: List[int], results) -> pd.DataFrame:
+    """Collect per-trial results in trial order, reporting skipped IDs."""
+    # Preallocated columns filled by position; skipped trials are masked out at the end
+    mean_curv = np.empty(len(trial_ids), dtype=np.float64)
+    ok = np.zeros(len(trial_ids), dtype=bool)
+    for i, (tid, (value, err)) in enumerate(zip(trial_ids, results)):
+        if err is not None:
+            print(f"Skipping ID {tid}: {err}")
+            continue
+        mean_curv[i] = value
+        ok[i] = True
+    return pd.DataFrame({'id': np.asarray(trial_ids, dtype=np.int64)[ok],
+                         'mean_curvature': mean_curv[ok]})
 
 
 # --- Main Test Block ----------------------------------------------------------